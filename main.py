@@ -1,84 +1,114 @@
+import os
 import xml.etree.ElementTree as ET
-from operator import itemgetter
-
-import pandas as pd
-from tkinter import filedialog as fd
-excepted_scale_format = ['6144', '12288']
-empty_par = {'name': '',
-             'address': '',
-             'editable': '',
-             'description': '',
-             'scale': '',
-             'scaleB': '',
-             'unit': '',
-             'value': '',
-             'scale_value': '',
-             'scale_format': '',
-             'type': '',
-             'group': '',
-             'period': ''}
-
-file_name = fd.askopenfilename()
-root_node = ET.parse(file_name).getroot()
-nodes = root_node.findall('param')
-final_list = []
-
-
-for tag in nodes:
-    tg = empty_par.copy()
-    t = tag.attrib
-
-    v_type = t['tdim']
-    if v_type == 'U32':
-        v_type = 'UNSIGNED32'
-    elif v_type == 'U16':
-        v_type = 'UNSIGNED16'
-    elif v_type == 'U8' or \
-            v_type == 'перечисление' or \
-            v_type == 'десятерич.' or \
-            v_type == 'двоич.':
-        v_type = 'UNSIGNED8'
-    elif v_type == 'I16vparam':
-        v_type = 'SIGNED16'
-    elif v_type == 'I32':
-        v_type = 'SIGNED32'
-    else:
-        v_type = 'SIGNED32'
-
-    scale = t['scale_value']
-    if int(scale) != 0:
-        scale = 16777216 / int(scale)
-
-    if t['scale_format'] in excepted_scale_format:
-        v_type = 'SIGNED16'
-        scale = 0
-
-    tg['name'] = t['FullText']
-    tg['address'] = hex(int(t['co_index'])) + hex(int(t['co_subindex']))[2:].zfill(2)
-    tg['editable'] = t['checked']
-    tg['description'] = t['EngText']
-    tg['scale'] = scale
-    tg['unit'] = t['tdim']
-    tg['scale_value'] = t['scale_value']
-    tg['scale_format'] = t['scale_format']
-    tg['type'] = v_type
-    tg['group'] = int(t['group_num'])  # возможно, здесь нужно делать проверку есть ли интежер, может,
-    # здесь название группы
-
-    final_list.append(tg.copy())
-final_list = sorted(final_list, key=itemgetter('group'))
-
-old_par = empty_par
-old_group = ''
-f_list = []
-for par in final_list:
-    if par['group'] != old_group:
-        old_group = par['group']
-        old_par['name'] = 'group ' + str(par['name'])
-        f_list.append(old_par.copy())
-    else:
-        if par['unit'] != 'корень':
-            f_list.append(par)
-df = pd.DataFrame(f_list, columns=tg.keys())
-
-df.to_excel(file_name.split('.')[0] + '_parse.xlsx', index=False)
+
+import numpy as np
+excepted_scale_format = {'6144', '12288'}
+# всё, что не нашлось в словаре, считается SIGNED32
+type_map = {'U32': 'UNSIGNED32',
+            'U16': 'UNSIGNED16',
+            'U8': 'UNSIGNED8',
+            'перечисление': 'UNSIGNED8',
+            'десятерич.': 'UNSIGNED8',
+            'двоич.': 'UNSIGNED8',
+            'I16vparam': 'SIGNED16',
+            'I32': 'SIGNED32'}
+
+
+def convert(file_name):
+    # pandas и openpyxl импортируются здесь, чтобы импорт модуля был дешёвым
+    import openpyxl
+    import pandas as pd
+
+    # каждая колонка итоговой таблицы - отдельный список
+    names = []
+    addresses = []
+    editables = []
+    descriptions = []
+    scales = []
+    units = []
+    scale_values = []
+    scale_formats = []
+    types = []
+    groups = []
+
+    # разбираем файл потоком, чтобы не держать в памяти всё дерево
+    context = ET.iterparse(file_name, events=('start', 'end'))
+    _, root_node = next(context)
+    for event, tag in context:
+        if event != 'end' or tag.tag != 'param':
+            continue
+        t = tag.attrib
+
+        v_type = type_map.get(t['tdim'], 'SIGNED32')
+
+        scale = t['scale_value']
+        if int(scale) != 0:
+            scale = 16777216 / int(scale)
+
+        if t['scale_format'] in excepted_scale_format:
+            v_type = 'SIGNED16'
+            scale = 0
+
+        names.append(t['FullText'])
+        addresses.append(f"0x{int(t['co_index']):x}{int(t['co_subindex']):02x}")
+        editables.append(t['checked'])
+        descriptions.append(t['EngText'])
+        scales.append(scale)
+        units.append(t['tdim'])
+        scale_values.append(t['scale_value'])
+        scale_formats.append(t['scale_format'])
+        types.append(v_type)
+        groups.append(int(t['group_num']))  # возможно, здесь нужно делать проверку есть ли интежер, может,
+        # здесь название группы
+        root_node.clear()
+
+    groups_array = np.asarray(groups)
+    order = np.argsort(groups_array, kind='stable')
+    groups_sorted = groups_array[order]
+
+    # первый параметр каждой группы становится её заголовком
+    is_header = np.ones(len(order), dtype=bool)
+    is_header[1:] = groups_sorted[1:] != groups_sorted[:-1]
+    keep = is_header | (np.asarray(units, dtype=object)[order] != 'корень')
+    rows = order[keep]
+    is_header = is_header[keep]
+
+    def take(column):
+        column = np.asarray(column, dtype=object)[rows]
+        column[is_header] = ''
+        return column
+
+    blank = np.full(len(rows), '', dtype=object)
+    name_column = np.asarray(names, dtype=object)[rows]
+    name_column[is_header] = ['group ' + str(name) for name in name_column[is_header]]
+    df = pd.DataFrame({'name': name_column,
+                       'address': take(addresses),
+                       'editable': take(editables),
+                       'description': take(descriptions),
+                       'scale': take(scales),
+                       'scaleB': blank,
+                       'unit': take(units),
+                       'value': blank,
+                       'scale_value': take(scale_values),
+                       'scale_format': take(scale_formats),
+                       'type': take(types),
+                       'group': take(groups),
+                       'period': blank}, copy=False)
+
+    # write_only пишет строки потоком, без стилей на каждую ячейку
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet('Sheet1')
+    ws.append(list(df.columns))
+    for row in df.itertuples(index=False, name=None):
+        ws.append(row)
+    wb.save(os.path.splitext(file_name)[0] + '_parse.xlsx')
+
+
+def main():
+    from tkinter import filedialog as fd
+
+    convert(fd.askopenfilename())
+
+
+if __name__ == '__main__':
+    main()